@@ -2,18 +2,48 @@
 """Utility to remove generated output files."""
 
 import argparse
-from pathlib import Path
+import os
 from typing import Iterable
 
+# Extensions removed by --dir mode
+OUTPUT_SUFFIXES = (".csv", ".json", ".xlsx", ".pdf")
+
 
 def _remove_files(paths: Iterable[str]) -> None:
     for name in paths:
-        p = Path(name)
-        if p.exists():
-            p.unlink()
-            print(f"Removed {p}")
+        try:
+            os.unlink(name)
+        except FileNotFoundError:
+            print(f"Skipping missing file {name}")
         else:
-            print(f"Skipping missing file {p}")
+            print(f"Removed {name}")
+
+
+def _remove_dir_outputs(directory: str) -> None:
+    # Where supported, unlink relative to one open directory handle (unlinkat)
+    # so the kernel does not resolve the directory path again for every file.
+    use_dir_fd = os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd
+    dfd = None
+    try:
+        if use_dir_fd:
+            dfd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        it = os.scandir(directory if dfd is None else dfd)
+    except FileNotFoundError:
+        print(f"Skipping missing directory {directory}")
+        return
+    except NotADirectoryError:
+        print(f"Skipping non-directory {directory}")
+        return
+
+    try:
+        with it:
+            for entry in it:
+                if entry.name.endswith(OUTPUT_SUFFIXES) and entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path if dfd is None else entry.name, dir_fd=dfd)
+                    print(f"Removed {os.path.join(directory, entry.name)}")
+    finally:
+        if dfd is not None:
+            os.close(dfd)
 
 
 def main() -> None:
@@ -22,9 +52,15 @@ def main() -> None:
     parser.add_argument("--json", nargs="*", default=[], help="JSON files to remove")
     parser.add_argument("--excel", nargs="*", default=[], help="Excel files to remove")
     parser.add_argument("--pdf", nargs="*", default=[], help="PDF files to remove")
+    parser.add_argument(
+        "--dir",
+        nargs="*",
+        default=[],
+        help="Directories whose CSV/JSON/Excel/PDF files should all be removed",
+    )
     args = parser.parse_args()
 
-    if not any([args.csv, args.json, args.excel, args.pdf]):
+    if not any([args.csv, args.json, args.excel, args.pdf, args.dir]):
         print("No files specified for cleanup.")
         return
 
@@ -32,6 +68,8 @@ def main() -> None:
     _remove_files(args.json)
     _remove_files(args.excel)
     _remove_files(args.pdf)
+    for directory in args.dir:
+        _remove_dir_outputs(directory)
 
 
 if __name__ == "__main__":
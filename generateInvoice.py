@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 import io
 from datetime import datetime
+from functools import lru_cache
 from pypdf import PdfReader, PdfWriter 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 
+@lru_cache(maxsize=None)
+def _load_template(template_path):
+    # Parse the template once per process; each invoice merges onto a copy
+    return PdfReader(template_path)
+
 def fill_invoice(template_path, output_path, invoice_data):
     # 1) Create a PDF in memory with your dynamic fields
     packet = io.BytesIO()
@@ -19,15 +25,14 @@ def fill_invoice(template_path, output_path, invoice_data):
     can.save()
     packet.seek(0)
 
-    # 2) Read the template PDF
-    template_pdf = PdfReader(template_path)
+    # 2) Read the (cached) template PDF
+    template_pdf = _load_template(template_path)
     overlay_pdf  = PdfReader(packet)
     writer       = PdfWriter()
 
-    # 3) Merge the overlay onto the first page
-    page = template_pdf.pages[0]
+    # 3) Merge the overlay onto the writer's copy of the first page
+    page = writer.add_page(template_pdf.pages[0])
     page.merge_page(overlay_pdf.pages[0])
-    writer.add_page(page)
 
     # 4) Write out the filled-in invoice
     with open(output_path, 'wb') as f:
@@ -1,91 +1,233 @@
 #!/usr/bin/env python3
 import pdfplumber
 import re
-import csv
 import json
 import argparse
+import mmap
+import os
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import NamedTuple
 
-def parse_transaction_pdf(pdf_path):
+# Optional: orjson for faster JSON export
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: PyMuPDF for much faster plain-text extraction
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+ENGINES = ("pdfplumber", "pymupdf")
+
+
+class Transaction(NamedTuple):
+    """One item line from a transaction PDF."""
+    client_code: str
+    date: str         # YYYY-MM-DD
+    time: str         # HH:MM
+    reference: str
+    employee: str
+    description: str
+    price: float
+
+
+# Header lines: code, date, time, reference, employee
+# (separators are [^\S\n]+, not \s+, so a header can never span two lines
+# of the multiline page scan below)
+HEADER_PATTERN = re.compile(
+    r'(?P<code>\d+)[^\S\n]+'
+    r'(?P<mm>\d{1,2})/(?P<dd>\d{1,2})/(?P<yy>\d{2})[^\S\n]+'
+    r'(?P<time>\d{1,2}:\d{2})[^\S\n]+'
+    r'#?(?P<ref>\d+)[^\S\n]+'
+    r'(?P<emp>\S+)'
+)
+
+# Item lines: description + price after the last space
+ITEM_PATTERN = re.compile(r'(?P<desc>.*) (?P<price>[^ \n]*)')
+
+# Currency symbol and thousands separators dropped from prices in one pass
+PRICE_STRIP_TABLE = str.maketrans('', '', '$,')
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL rules)
+CSV_QUOTE_PATTERN = re.compile(r'[,"\r\n]')
+
+# One scan over a page's text classifies each line as a header or an item
+LINE_PATTERN = re.compile(
+    rf'^(?:{HEADER_PATTERN.pattern}.*|{ITEM_PATTERN.pattern})$',
+    re.MULTILINE,
+)
+
+@contextmanager
+def _open_plumber(pdf_path, pages=None):
     """
-    Parses a transaction PDF and returns a list of records where each record is a dict:
-      {
-        "client_code": str,
-        "date": "YYYY-MM-DD",
-        "time": "HH:MM",
-        "reference": str,
-        "employee": str,
-        "description": str,
-        "price": float
-      }
+    Opens the PDF with pdfplumber over a read-only mmap of the file, so
+    pdfminer's many small seeks and reads are served from the page cache
+    instead of going through buffered file I/O.
+    """
+    with open(pdf_path, 'rb') as fh:
+        st = os.fstat(fh.fileno())
+        # mmap rejects empty files and cannot map pipes; let pdfplumber open
+        # those by path so it reports its usual errors
+        if not (stat.S_ISREG(st.st_mode) and st.st_size):
+            with pdfplumber.open(pdf_path, pages=pages) as pdf:
+                yield pdf
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                pdfplumber.open(mm, pages=pages) as pdf:
+            yield pdf
+
+def _extract_pages_text(pdf_path, page_numbers=None, engine="pdfplumber"):
+    """
+    Extracts the text of the given 1-based pages (all pages when None);
+    runs in a worker process when the pool is used.
+    """
+    if engine == "pymupdf":
+        with pymupdf.open(pdf_path) as doc:
+            if page_numbers is None:
+                return [page.get_text("text") for page in doc]
+            return [doc[n - 1].get_text("text") for n in page_numbers]
+    with _open_plumber(pdf_path, pages=page_numbers) as pdf:
+        return [page.extract_text() for page in pdf.pages]
+
+def _page_count(pdf_path, engine):
+    if engine == "pymupdf":
+        with pymupdf.open(pdf_path) as doc:
+            return doc.page_count
+    with _open_plumber(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def extract_page_texts(pdf_path, workers=None, engine="pdfplumber"):
+    """
+    Returns the text of every page in order. Pages are split into contiguous
+    chunks and extracted in parallel processes, since layout analysis is
+    CPU-bound.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+    if engine == "pymupdf" and pymupdf is None:
+        raise ValueError("PyMuPDF not installed; install pymupdf or use the pdfplumber engine")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if workers == 1:
+        # Serial: one open, one pass over every page
+        return _extract_pages_text(pdf_path, engine=engine)
+
+    n_pages = _page_count(pdf_path, engine)
+    if n_pages < 2:
+        return _extract_pages_text(pdf_path, engine=engine)
+
+    workers = min(workers, n_pages)
+    size = -(-n_pages // workers)
+    chunks = [list(range(start + 1, min(start + size, n_pages) + 1))
+              for start in range(0, n_pages, size)]
+    extract = partial(_extract_pages_text, pdf_path, engine=engine)
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        return [text for chunk in executor.map(extract, chunks) for text in chunk]
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def parse_page_texts(texts):
+    """
+    Classifies the lines of each page text as headers or items and returns
+    the item lines as Transaction tuples. A header stays current across
+    page boundaries until the next one.
+
+    A header never spans lines, so a stray number line cannot start one:
+
+    >>> text = ("1000 7/1/25 10:00 #5 emp\\nBurger $1.00\\n2025\\n"
+    ...         "7/2/25 11:00 #6 bob\\nFries $2.00\\n")
+    >>> [(t.client_code, t.description, t.price) for t in parse_page_texts([text])]
+    [('1000', 'Burger', 1.0), ('1000', 'Fries', 2.0)]
     """
     records = []
-    header_info = {}
-
-    # regex to detect header lines: code, date, time, reference, employee
-    header_pattern = re.compile(
-        r'^(?P<code>\d+)\s+'
-        r'(?P<date>\d{1,2}/\d{1,2}/\d{2})\s+'
-        r'(?P<time>\d{1,2}:\d{2})\s+'
-        r'#?(?P<ref>\d+)\s+'
-        r'(?P<emp>\S+)'
-    )
+    header = None
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            for line in text.split('\n'):
-                # Try matching header
-                m = header_pattern.match(line)
-                if m:
-                    info = m.groupdict()
-                    # Normalize date to YYYY-MM-DD
-                    mm, dd, yy = info['date'].split('/')
-                    yyyy = '20' + yy
-                    info['date'] = f"{yyyy}-{int(mm):02d}-{int(dd):02d}"
-                    info['client_code'] = info.pop('code')
-                    info['reference']   = info.pop('ref')
-                    info['employee']    = info.pop('emp')
-                    info['time']        = info['time']
-                    header_info = info
-                else:
-                    # Attempt to parse an item line: description + price at end
-                    parts = line.rsplit(' ', 1)
-                    if len(parts) == 2 and header_info:
-                        desc, price_str = parts
-                        # Clean price string
-                        price_str = price_str.replace('$', '').replace(',', '')
-                        try:
-                            price = float(price_str)
-                        except ValueError:
-                            continue
-                        record = {
-                            "client_code": header_info['client_code'],
-                            "date":        header_info['date'],
-                            "time":        header_info['time'],
-                            "reference":   header_info['reference'],
-                            "employee":    header_info['employee'],
-                            "description": desc.strip(),
-                            "price":       price
-                        }
-                        records.append(record)
+    for text in texts:
+        if not text:
+            continue
+        for m in LINE_PATTERN.finditer(text):
+            if m.group('code') is not None:
+                # Header line: normalize M/D/YY to YYYY-MM-DD
+                header = (
+                    m.group('code'),
+                    '20' + m.group('yy') + '-' + m.group('mm').zfill(2)
+                    + '-' + m.group('dd').zfill(2),
+                    m.group('time'),
+                    m.group('ref'),
+                    m.group('emp'),
+                )
+            elif header:
+                # Item line: description + price at end
+                price_str = m.group('price').translate(PRICE_STRIP_TABLE)
+                try:
+                    price = float(price_str)
+                except ValueError:
+                    continue
+                records.append(Transaction(*header, m.group('desc').strip(), price))
     return records
 
-def export_data(records, csv_path, json_path):
+def parse_transaction_pdf(pdf_path, workers=None, engine="pdfplumber"):
+    """
+    Parses a transaction PDF and returns a list of Transaction tuples
+    (client_code, date, time, reference, employee, description, price).
+    """
+    return parse_page_texts(extract_page_texts(pdf_path, workers, engine))
+
+def _csv_field(value):
+    if CSV_QUOTE_PATTERN.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _write_csv(records, csv_path):
+    """
+    Writes records in the same format as csv.writer, specialised to the
+    Transaction schema: code, date, time and reference are regex-matched
+    digits/punctuation that never need quoting, so only employee and
+    description go through the quoting check.
+    """
+    with open(csv_path, 'w', newline='', buffering=1 << 20) as f_csv:
+        f_csv.write(','.join(Transaction._fields) + '\r\n')
+        f_csv.writelines(
+            f"{code},{date},{time},{ref},{_csv_field(emp)},{_csv_field(desc)},{price!r}\r\n"
+            for code, date, time, ref, emp, desc, price in records
+        )
+
+def export_data(records, csv_path, json_path, pretty_json=True):
     if not records:
         print("No records to export. ")
         return
     
     # Write CSV
-    with open(csv_path,'w', newline='') as f_csv:
-        writer = csv.DictWriter(f_csv, fieldnames=records[0].keys())
-        writer.writeheader()
-        writer.writerows(records)
+    _write_csv(records, csv_path)
 
-    # Write JSON
-    with open(json_path, 'w') as f_json:
-        json.dump(records, f_json, indent=2)
+    # Write JSON (dicts are only built here, at the export boundary)
+    rows = [r._asdict() for r in records]
+    if orjson:
+        option = orjson.OPT_INDENT_2 if pretty_json else None
+        with open(json_path, 'wb') as f_json:
+            f_json.write(orjson.dumps(rows, option=option))
+    elif pretty_json:
+        with open(json_path, 'w') as f_json:
+            json.dump(rows, f_json, indent=2)
+    else:
+        with open(json_path, 'w') as f_json:
+            json.dump(rows, f_json, separators=(',', ':'))
 
     print(f"Exported {len(records)} records to '{csv_path}' and '{json_path}'")
 
@@ -105,8 +247,27 @@ if __name__ == "__main__":
         default="transactions.json",
         help="Output JSON file path",
     )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Processes used for page text extraction (default: CPU count)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="pdfplumber",
+        help="Text extraction backend (pymupdf is faster but optional)",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write JSON without indentation (for machine consumers)",
+    )
     args = parser.parse_args()
+    if args.engine == "pymupdf" and pymupdf is None:
+        parser.error("--engine pymupdf requires PyMuPDF; install pymupdf or use pdfplumber")
 
-    records = parse_transaction_pdf(args.pdf_file)
-    export_data(records, args.csv, args.json)
+    records = parse_transaction_pdf(args.pdf_file, args.workers, args.engine)
+    export_data(records, args.csv, args.json, pretty_json=not args.compact_json)
     
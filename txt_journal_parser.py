@@ -15,8 +15,12 @@ This script:
 import csv
 import json
 import argparse
+import mmap
+import os
+import re
+import stat
 import sys
-from datetime import datetime
+from contextlib import contextmanager
 
 # Optional: pandas for Excel export
 try:
@@ -24,54 +28,110 @@ try:
 except ImportError:
     pd = None
 
+# Optional: xlsxwriter for streamed (constant-memory) Excel export
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Optional: orjson for faster JSON export
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Lines of interest in the journal, matched straight off the mapped file:
+# MM-DD-YY date headers and account 1105 entries (with their amount column)
+LINE_PATTERN = re.compile(
+    rb'^[ \t]*(?:'
+    rb'(?P<mm>\d\d)-(?P<dd>\d\d)-(?P<yy>\d\d)[ \t]*(?:,|\r?$)'
+    rb'|1105[ \t]*,(?P<amount>[^,\r\n]*)'
+    rb')',
+    re.MULTILINE,
+)
+
+# Output column order for CSV/Excel
+FIELDS = ('date', 'account', 'amount')
+
+
+@contextmanager
+def _journal_buffer(f):
+    """
+    Yield the contents of an open binary file for scanning: a read-only mmap
+    for non-empty regular files, otherwise the bytes read from it (pipes,
+    FIFOs and /dev/stdin report size 0, and mmap rejects empty files).
+    """
+    st = os.fstat(f.fileno())
+    if stat.S_ISREG(st.st_mode) and st.st_size:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+    else:
+        yield f.read()
+
 
 def parse_journal_entries(txt_path):
     """
     Parse a multi-day journal entry TXT file to extract all account 1105 transactions.
 
+    The file is memory-mapped and scanned with a single multiline regex, so
+    lines for other accounts are skipped inside the regex engine without
+    being copied or decoded.
+
     Args:
         txt_path (str): Path to the journal entry TXT file.
 
     Returns:
-        list of dict: Each dict has 'date', 'account', and 'amount'.
+        dict of list: Parallel 'date', 'account', and 'amount' columns,
+        one element per transaction.
     """
-    entries = []
+    dates = []
+    amounts = []
     current_date = None
     try:
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
+        with open(txt_path, 'rb') as f, _journal_buffer(f) as data:
+            for m in LINE_PATTERN.finditer(data):
+                # Date header (MM-DD-YY)
+                if m.group('yy') is not None:
+                    current_date = (b'20%s-%s-%s' % m.group('yy', 'mm', 'dd')).decode()
                     continue
-                parts = [p.strip() for p in line.split(',')]
-                # Check for date header (MM-DD-YY)
-                if len(parts) >= 1:
-                    try:
-                        dt = datetime.strptime(parts[0], '%m-%d-%y')
-                        current_date = dt.strftime('%Y-%m-%d')
-                        continue
-                    except ValueError:
-                        pass
-                # If we have a current_date, look for account 1105 lines
-                if current_date and len(parts) >= 2 and parts[0] == '1105':
+                # Account 1105 entry under the current date
+                if current_date:
                     try:
-                        amt = float(parts[1].replace(',', ''))
+                        amt = float(m.group('amount'))
                     except ValueError:
-                        print(f"Warning: invalid amount '{parts[1]}' on date {current_date}")
+                        print(f"Warning: invalid amount '{m.group('amount').strip().decode(errors='replace')}' on date {current_date}")
                         continue
-                    entries.append({
-                        'date': current_date,
-                        'account': '1105',
-                        'amount': amt
-                    })
+                    dates.append(current_date)
+                    amounts.append(amt)
     except FileNotFoundError:
         raise ValueError(f"File not found: {txt_path}")
     except Exception as e:
         raise ValueError(f"Failed to read {txt_path}: {e}")
 
-    if not entries:
+    if not dates:
         raise ValueError(f"No transactions for account 1105 found in {txt_path}")
-    return entries
+    return {'date': dates, 'account': ['1105'] * len(dates), 'amount': amounts}
+
+
+def iter_rows(columns):
+    """Yield (date, account, amount) tuples from parsed columns."""
+    return zip(*(columns[f] for f in FIELDS))
+
+
+def write_excel(columns, excel_path):
+    """
+    Stream parsed columns to an .xlsx file with xlsxwriter in constant_memory mode,
+    which flushes each row to disk as soon as the next one starts instead of
+    keeping the whole worksheet in memory. Rows must be written in order.
+    """
+    workbook = xlsxwriter.Workbook(excel_path, {'constant_memory': True})
+    try:
+        sheet = workbook.add_worksheet('Sheet1')
+        sheet.write_row(0, 0, FIELDS)
+        for row, values in enumerate(iter_rows(columns), start=1):
+            sheet.write_row(row, 0, values)
+    finally:
+        workbook.close()
 
 
 def main():
@@ -101,45 +161,52 @@ def main():
     args = parser.parse_args()
 
     try:
-        records = parse_journal_entries(args.txt_file)
+        columns = parse_journal_entries(args.txt_file)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
     # Write CSV
     try:
-        with open(args.csv, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=['date', 'account', 'amount'])
-            writer.writeheader()
-            for r in records:
-                writer.writerow(r)
+        with open(args.csv, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(FIELDS)
+            writer.writerows(iter_rows(columns))
     except Exception as e:
         print(f"Failed to write CSV: {e}")
         sys.exit(1)
 
-    # Write JSON
+    # Write JSON (records are only materialised as dicts here)
     try:
-        with open(args.json, 'w', encoding='utf-8') as jsonfile:
-            json.dump(records, jsonfile, indent=2)
+        records = [dict(zip(FIELDS, row)) for row in iter_rows(columns)]
+        if orjson:
+            with open(args.json, 'wb') as jsonfile:
+                jsonfile.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.json, 'w', encoding='utf-8') as jsonfile:
+                json.dump(records, jsonfile, indent=2)
     except Exception as e:
         print(f"Failed to write JSON: {e}")
         sys.exit(1)
 
-    # Write Excel if pandas is available
-    if pd:
+    # Write Excel if xlsxwriter or pandas is available
+    if xlsxwriter or pd:
         try:
-            df = pd.DataFrame(records)
-            df.to_excel(args.excel, index=False)
+            if xlsxwriter:
+                write_excel(columns, args.excel)
+            else:
+                df = pd.DataFrame(columns, columns=list(FIELDS))
+                df.to_excel(args.excel, index=False)
         except Exception as e:
             print(f"Failed to write Excel: {e}")
             sys.exit(1)
     else:
-        print("Pandas not installed; skipping Excel export. Install pandas to enable this feature.")
+        print("Neither xlsxwriter nor pandas installed; skipping Excel export. Install one to enable this feature.")
 
     # Print transactions to console
-    print(f"Parsed {len(records)} transactions for account 1105:")
-    for rec in records:
-        print(f"{rec['date']}, Account {rec['account']}, Amount {rec['amount']}")
+    print(f"Parsed {len(columns['date'])} transactions for account 1105:")
+    for date, account, amount in iter_rows(columns):
+        print(f"{date}, Account {account}, Amount {amount}")
 
 if __name__ == '__main__':
     main()